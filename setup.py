@@ -88,6 +88,7 @@ setup(
             "codecov",
             "colorlog",
             "crick",
+            "orjson",
             "matplotlib",
             "moto",
             "aws-xray-sdk",
@@ -101,7 +102,14 @@ setup(
             "pymysql>=1.0.0",
             "psycopg2",
         ],
-        "recommended": ["colorlog", "crick", "pymysql>=1.0.0", "psycopg2"],
+        "recommended": [
+            "colorlog",
+            "crick",
+            "orjson",
+            "pymysql>=1.0.0",
+            "mysqlclient",
+            "psycopg2",
+        ],
     },
     # CLI
     entry_points="""
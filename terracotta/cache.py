@@ -3,20 +3,24 @@
 Custom cache implementations.
 """
 
-from typing import Tuple, Callable, Any
+from typing import Tuple, Callable, Any, List, MutableMapping
 
 import sys
+import threading
 import zlib
 
 import numpy as np
-from cachetools import LFUCache
+from cachetools import Cache, LFUCache, LRUCache
 
 CompressionTuple = Tuple[bytes, bytes, str, Tuple[int, int]]
 SizeFunction = Callable[[CompressionTuple], int]
 
 
-class CompressedLFUCache(LFUCache):
-    """Least-frequently-used cache with ZLIB compression"""
+class CompressedCache(Cache):
+    """Cache of masked arrays with ZLIB compression
+
+    Combine with a cachetools cache class to pick the eviction strategy.
+    """
 
     def __init__(self, maxsize: int, compression_level: int):
         super().__init__(maxsize, self._get_size)
@@ -53,3 +57,40 @@ class CompressedLFUCache(LFUCache):
     def _get_size(x: Tuple) -> int:
         sizes = map(sys.getsizeof, x)
         return sum(sizes)
+
+
+class CompressedLFUCache(CompressedCache, LFUCache):
+    """Least-frequently-used cache with ZLIB compression"""
+
+
+class CompressedLRUCache(CompressedCache, LRUCache):
+    """Least-recently-used cache with ZLIB compression"""
+
+
+class ShardedCache:
+    """Thread-safe cache that distributes entries over several independently locked shards
+
+    Concurrent accesses only contend for a lock if their keys fall into the same shard.
+    """
+
+    def __init__(
+        self, cache_factory: Callable[[], MutableMapping], num_shards: int = 16
+    ):
+        self.shards: List[MutableMapping] = [cache_factory() for _ in range(num_shards)]
+        self.locks: List[threading.Lock] = [threading.Lock() for _ in range(num_shards)]
+
+    def _shard_index(self, key: Any) -> int:
+        return hash(key) % len(self.shards)
+
+    def __getitem__(self, key: Any) -> Any:
+        idx = self._shard_index(key)
+        with self.locks[idx]:
+            return self.shards[idx][key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        idx = self._shard_index(key)
+        with self.locks[idx]:
+            self.shards[idx][key] = value
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
@@ -35,7 +35,9 @@ class TerracottaSettings(NamedTuple):
     #: Default log level (debug, info, warning, error, critical)
     LOGLEVEL: str = "warning"
 
-    #: Size of raster file in-memory cache in bytes
+    #: Size of raster file in-memory cache in bytes. 10% of it holds recently used tiles
+    #: uncompressed, the rest is split into up to 16 compressed shards of at least 16 MB
+    #: each; tiles larger than one shard are not cached.
     RASTER_CACHE_SIZE: int = 1024 * 1024 * 490  # 490 MB
 
     #: Compression level of raster file in-memory cache, from 0-9
@@ -53,6 +55,27 @@ class TerracottaSettings(NamedTuple):
     #: Timeout in seconds for database connections
     DB_CONNECTION_TIMEOUT: int = 10
 
+    #: Number of connections to keep open per database server (when using mysql or postgresql)
+    DB_POOL_SIZE: int = 5
+
+    #: Maximum age in seconds of pooled database connections before they are replaced
+    #: (when using mysql or postgresql, -1 to disable)
+    DB_POOL_RECYCLE: int = 1800
+
+    #: Number of datasets to keep metadata for in memory (0 to disable). Cached
+    #: metadata does not reflect changes made by other processes until it expires.
+    METADATA_CACHE_SIZE: int = 1024
+
+    #: Time in seconds before cached metadata expires (0 to disable caching)
+    METADATA_CACHE_TTL: int = 60
+
+    #: Number of dataset queries to keep results for in memory (0 to disable). Cached
+    #: results do not reflect changes made by other processes until they expire.
+    DATASETS_CACHE_SIZE: int = 128
+
+    #: Time in seconds before cached dataset query results expire (0 to disable caching)
+    DATASETS_CACHE_TTL: int = 10
+
     #: Path where cached remote SQLite databases are stored (when using sqlite-remote provider)
     REMOTE_DB_CACHE_DIR: str = os.path.join(tempfile.gettempdir(), "terracotta")
 
@@ -138,6 +161,12 @@ class SettingSchema(Schema):
     PNG_COMPRESS_LEVEL = fields.Integer(validate=validate.Range(min=0, max=9))
 
     DB_CONNECTION_TIMEOUT = fields.Integer(validate=validate.Range(min=0))
+    DB_POOL_SIZE = fields.Integer(validate=validate.Range(min=1))
+    DB_POOL_RECYCLE = fields.Integer(validate=validate.Range(min=-1))
+    METADATA_CACHE_SIZE = fields.Integer(validate=validate.Range(min=0))
+    METADATA_CACHE_TTL = fields.Integer(validate=validate.Range(min=0))
+    DATASETS_CACHE_SIZE = fields.Integer(validate=validate.Range(min=0))
+    DATASETS_CACHE_TTL = fields.Integer(validate=validate.Range(min=0))
     REMOTE_DB_CACHE_DIR = fields.String(validate=_is_writable)
     REMOTE_DB_CACHE_TTL = fields.Integer(validate=validate.Range(min=0))
 
@@ -3,6 +3,7 @@
 Define an interface to retrieve Terracotta drivers.
 """
 
+import functools
 import os
 from typing import Optional, Union, Tuple, Dict, Type
 import urllib.parse as urlparse
@@ -58,6 +59,13 @@ def auto_detect_provider(url_or_path: str) -> str:
 _DRIVER_CACHE: Dict[Tuple[URLOrPathType, str, int], TerracottaDriver] = {}
 
 
+@functools.lru_cache(maxsize=128)
+def _normalize_path(DriverClass: Type[MetaStore], url_or_path: str, cwd: str) -> str:
+    # get_driver is called on every request, so avoid re-parsing the same paths;
+    # relative paths depend on the working directory, so it is part of the cache key
+    return DriverClass._normalize_path(url_or_path)
+
+
 def get_driver(
     url_or_path: URLOrPathType, provider: Optional[str] = None
 ) -> TerracottaDriver:
@@ -87,13 +95,13 @@ def get_driver(
         )
         >>> tc.get_driver('mysql://root@localhost/tc')
         TerracottaDriver(
-            meta_store=MySQLDriver('mysql+pymysql://localhost:3306/tc'),
+            meta_store=MySQLDriver('mysql://localhost:3306/tc'),
             raster_store=GeoTiffRasterStore()
         )
         >>> # pass provider if path is given in a non-standard way
         >>> tc.get_driver('root@localhost/tc', provider='mysql')
         TerracottaDriver(
-            meta_store=MySQLDriver('mysql+pymysql://localhost:3306/tc'),
+            meta_store=MySQLDriver('mysql://localhost:3306/tc'),
             raster_store=GeoTiffRasterStore()
         )
 
@@ -106,7 +114,7 @@ def get_driver(
         provider = auto_detect_provider(url_or_path)
 
     DriverClass = load_driver(provider)
-    normalized_path = DriverClass._normalize_path(url_or_path)
+    normalized_path = _normalize_path(DriverClass, url_or_path, os.getcwd())
     cache_key = (normalized_path, provider, os.getpid())
 
     if cache_key not in _DRIVER_CACHE:
@@ -6,11 +6,11 @@ Base class for drivers.
 import contextlib
 import functools
 from abc import ABC, abstractmethod
-from collections import OrderedDict
 from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Mapping,
     Optional,
@@ -24,9 +24,13 @@ from terracotta import exceptions
 
 KeysType = Mapping[str, str]
 MultiValueKeysType = Mapping[str, Union[str, List[str]]]
+DatasetEntryType = Tuple[KeysType, str, Optional[Mapping[str, Any]]]
 Number = TypeVar("Number", int, float)
 T = TypeVar("T")
 
+# metadata fields that are cheap to retrieve (no large text or binary columns)
+LITE_METADATA_KEYS = ("bounds", "valid_percentage", "range", "mean", "stdev")
+
 
 def requires_writable(fun: Callable[..., T]) -> Callable[..., T]:
     @functools.wraps(fun)
@@ -89,7 +93,7 @@ class MetaStore(ABC):
         pass
 
     @abstractmethod
-    def get_keys(self) -> OrderedDict:
+    def get_keys(self) -> Dict[str, str]:
         """Get all known keys and their fulltext descriptions."""
         pass
 
@@ -99,9 +103,14 @@ class MetaStore(ABC):
         where: Optional[MultiValueKeysType] = None,
         page: int = 0,
         limit: Optional[int] = None,
+        *,
+        use_cache: bool = True,
     ) -> Dict[Tuple[str, ...], Any]:
         """Get all known dataset key combinations matching the given constraints,
         and a path to retrieve the data
+
+        Backends that cache results must read from the database if ``use_cache``
+        is False.
         """
         pass
 
@@ -110,6 +119,26 @@ class MetaStore(ABC):
         """Return all stored metadata for given keys."""
         pass
 
+    def get_metadata_many(
+        self, keys: Sequence[KeysType]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Return all stored metadata for several datasets, in the order given.
+
+        Backends that support batched reads should override this.
+        """
+        return [self.get_metadata(dataset_keys) for dataset_keys in keys]
+
+    def get_metadata_lite(self, keys: KeysType) -> Optional[Dict[str, Any]]:
+        """Return only the scalar metadata for given keys.
+
+        Backends that store large columns (convex hull, percentiles, extra metadata)
+        separately should override this to skip reading them.
+        """
+        metadata = self.get_metadata(keys)
+        if metadata is None:
+            return None
+        return {key: metadata[key] for key in LITE_METADATA_KEYS}
+
     @abstractmethod
     def insert(
         self, keys: KeysType, path: str, *, metadata: Optional[Mapping[str, Any]] = None
@@ -118,6 +147,14 @@ class MetaStore(ABC):
         if metadata is specified and not `None`."""
         pass
 
+    def insert_many(self, datasets: Iterable[DatasetEntryType]) -> None:
+        """Register several datasets at once, given as ``(keys, path, metadata)`` tuples.
+
+        Backends that support batched writes should override this.
+        """
+        for keys, path, metadata in datasets:
+            self.insert(keys, path, metadata=metadata)
+
     @abstractmethod
     def delete(self, keys: KeysType) -> None:
         """Remove a dataset, including information from the metadata database."""
@@ -143,7 +180,10 @@ class RasterStore(ABC):
         preserve_values: bool = False,
         asynchronous: bool = False,
     ) -> Any:
-        """Load a raster tile with given path and bounds."""
+        """Load a raster tile with given path and bounds.
+
+        Stores that cache tiles may return read-only arrays.
+        """
         pass
 
     @abstractmethod
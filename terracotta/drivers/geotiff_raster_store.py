@@ -13,10 +13,11 @@ import warnings
 import threading
 
 import numpy as np
+from cachetools import LRUCache
 
 from terracotta import get_settings
 from terracotta import raster
-from terracotta.cache import CompressedLFUCache
+from terracotta.cache import CompressedLRUCache, ShardedCache
 from terracotta.drivers.base_classes import RasterStore
 
 Number = TypeVar("Number", int, float)
@@ -25,11 +26,16 @@ logger = logging.getLogger(__name__)
 
 _executor = None
 
+# whether process pools can be created on this system (None = not checked yet)
+_multiprocessing_available: Optional[bool] = None
+
 
 def create_executor() -> Executor:
+    global _multiprocessing_available
+
     settings = get_settings()
 
-    if not settings.USE_MULTIPROCESSING:
+    if not settings.USE_MULTIPROCESSING or _multiprocessing_available is False:
         return ThreadPoolExecutor(max_workers=1)
 
     executor: Executor
@@ -43,7 +49,10 @@ def create_executor() -> Executor:
             "Multiprocessing is not available on this system. "
             "Falling back to serial execution."
         )
+        _multiprocessing_available = False
         executor = ThreadPoolExecutor(max_workers=1)
+    else:
+        _multiprocessing_available = True
 
     return executor
 
@@ -75,6 +84,22 @@ def ensure_hashable(val: Any) -> Any:
     return val
 
 
+def _get_tile_nbytes(arr: np.ma.MaskedArray) -> int:
+    """Memory used by data and mask of the given array"""
+    mask = np.ma.getmask(arr)
+    mask_nbytes = mask.nbytes if mask is not np.ma.nomask else 0
+    return arr.nbytes + mask_nbytes
+
+
+def _make_readonly(arr: np.ma.MaskedArray) -> np.ma.MaskedArray:
+    """Prevent in-place modification of data and mask of the given array"""
+    arr.flags.writeable = False
+    mask = np.ma.getmask(arr)
+    if mask is not np.ma.nomask:
+        mask.flags.writeable = False
+    return arr
+
+
 class GeoTiffRasterStore(RasterStore):
     """Raster store that operates on GeoTiff raster files from disk.
 
@@ -83,17 +108,39 @@ class GeoTiffRasterStore(RasterStore):
 
     _TARGET_CRS: str = "epsg:3857"
     _LARGE_RASTER_THRESHOLD: int = 10980 * 10980
+    _CACHE_SHARDS: int = 16  # max. number of independently locked cache shards
+    _MIN_CACHE_SHARD_SIZE: int = 1024 * 1024 * 16  # 16 MB
+    _HOT_CACHE_FRACTION: float = (
+        0.1  # share of RASTER_CACHE_SIZE for uncompressed tiles
+    )
     _RIO_ENV_OPTIONS = dict(
         GDAL_TIFF_INTERNAL_MASK=True, GDAL_DISABLE_READDIR_ON_OPEN="EMPTY_DIR"
     )
 
     def __init__(self) -> None:
         settings = get_settings()
-        self._raster_cache = CompressedLFUCache(
-            settings.RASTER_CACHE_SIZE,
-            compression_level=settings.RASTER_CACHE_COMPRESS_LEVEL,
+        hot_cache_size = int(settings.RASTER_CACHE_SIZE * self._HOT_CACHE_FRACTION)
+        compressed_cache_size = settings.RASTER_CACHE_SIZE - hot_cache_size
+
+        # small caches get fewer shards, so every shard can still hold large tiles
+        num_shards = max(
+            1,
+            min(
+                self._CACHE_SHARDS,
+                compressed_cache_size // self._MIN_CACHE_SHARD_SIZE,
+            ),
         )
-        self._cache_lock = threading.RLock()
+        self._raster_cache = ShardedCache(
+            lambda: CompressedLRUCache(
+                compressed_cache_size // num_shards,
+                compression_level=settings.RASTER_CACHE_COMPRESS_LEVEL,
+            ),
+            num_shards=num_shards,
+        )
+        # small uncompressed cache in front of the compressed one,
+        # so hits on popular tiles skip decompression
+        self._hot_cache: LRUCache = LRUCache(hot_cache_size, getsizeof=_get_tile_nbytes)
+        self._hot_cache_lock = threading.Lock()
 
     def compute_metadata(
         self,
@@ -144,8 +191,7 @@ class GeoTiffRasterStore(RasterStore):
         cache_key = hash(ensure_hashable(kwargs))
 
         try:
-            with self._cache_lock:
-                result = self._raster_cache[cache_key]
+            result = self._get_from_cache(cache_key)
         except KeyError:
             pass
         else:
@@ -174,9 +220,29 @@ class GeoTiffRasterStore(RasterStore):
             cache_callback(future)
             return result
 
+    def _get_from_cache(self, key: Any) -> np.ma.MaskedArray:
+        with self._hot_cache_lock:
+            result = self._hot_cache.get(key)
+
+        if result is None:
+            result = _make_readonly(self._raster_cache[key])
+            self._add_to_hot_cache(key, result)
+
+        return result
+
+    def _add_to_hot_cache(self, key: Any, value: np.ma.MaskedArray) -> None:
+        with self._hot_cache_lock:
+            try:
+                self._hot_cache[key] = value
+            except ValueError:  # value too large
+                pass
+
     def _add_to_cache(self, key: Any, value: Any) -> None:
         try:
-            with self._cache_lock:
-                self._raster_cache[key] = value
+            self._raster_cache[key] = value
         except ValueError:  # value too large
-            pass
+            return
+
+        # the same object is handed out on every hit, so nobody may modify it
+        _make_readonly(value)
+        self._add_to_hot_cache(key, value)
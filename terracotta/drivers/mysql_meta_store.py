@@ -7,9 +7,16 @@ import functools
 from typing import Optional, Mapping, Sequence
 
 import sqlalchemy as sqla
-from sqlalchemy.dialects.mysql import TEXT, VARCHAR
+from sqlalchemy.dialects.mysql import TEXT, VARCHAR, insert
 from terracotta.drivers.relational_meta_store import RelationalMetaStore
 
+try:
+    import MySQLdb  # noqa: F401
+
+    has_mysqlclient = True
+except ImportError:  # pragma: no cover
+    has_mysqlclient = False
+
 
 class MySQLMetaStore(RelationalMetaStore):
     """A MySQL-backed metadata driver.
@@ -26,10 +33,13 @@ class MySQLMetaStore(RelationalMetaStore):
     - ``metadata``: Contains actual metadata as separate columns. Indexed via key values.
 
     This driver caches key names.
+
+    Uses the ``mysqlclient`` package (a C extension) to talk to the server if it is
+    installed, and falls back to the pure-Python ``pymysql`` otherwise.
     """
 
     SQL_DIALECT = "mysql"
-    SQL_DRIVER = "pymysql"
+    SQL_DRIVER = "mysqldb" if has_mysqlclient else "pymysql"
     SQL_TIMEOUT_KEY = "connect_timeout"
 
     _CHARSET = "utf8mb4"
@@ -65,7 +75,8 @@ class MySQLMetaStore(RelationalMetaStore):
     def _normalize_path(cls, path: str) -> str:
         url = cls._parse_path(path)
 
-        path = f"{url.drivername}://{url.host}:{url.port or cls.DEFAULT_PORT}/{url.database}"
+        # leave out the DBAPI driver, which depends on the installed packages
+        path = f"{cls.SQL_DIALECT}://{url.host}:{url.port or cls.DEFAULT_PORT}/{url.database}"
         path = path.rstrip("/")
         return path
 
@@ -77,9 +88,22 @@ class MySQLMetaStore(RelationalMetaStore):
             echo=False,
             future=True,
         )
-        with engine.connect() as connection:
-            connection.execute(sqla.text(f"CREATE DATABASE {self.url.database}"))
-            connection.commit()
+        # the database does not exist yet, so this cannot go through self.sqla_engine
+        try:
+            with engine.connect() as connection:
+                connection.execute(sqla.text(f"CREATE DATABASE {self.url.database}"))
+                connection.commit()
+        finally:
+            # do not keep idle connections to the server around
+            engine.dispose()
+
+    def _upsert_stmt(self, table: sqla.Table) -> sqla.sql.Insert:
+        # ON DUPLICATE KEY UPDATE modifies rows in place, unlike REPLACE which
+        # deletes and re-inserts them
+        stmt = insert(table)
+        return stmt.on_duplicate_key_update(
+            {c.name: stmt.inserted[c.name] for c in table.columns if not c.primary_key}
+        )
 
     def _initialize_database(
         self, keys: Sequence[str], key_descriptions: Optional[Mapping[str, str]] = None
@@ -6,6 +6,7 @@ PostgreSQL-backed metadata driver. Metadata is stored in a PostgreSQL database.
 from typing import Optional, Mapping, Sequence
 
 import sqlalchemy as sqla
+from sqlalchemy.dialects.postgresql import insert
 from terracotta.drivers.relational_meta_store import RelationalMetaStore
 
 
@@ -70,9 +71,25 @@ class PostgreSQLMetaStore(RelationalMetaStore):
             future=True,
             isolation_level="AUTOCOMMIT",
         )
-        with engine.connect() as connection:
-            connection.execute(sqla.text(f"CREATE DATABASE {self.url.database}"))
-            connection.commit()
+        # the database does not exist yet, so this cannot go through self.sqla_engine
+        try:
+            with engine.connect() as connection:
+                connection.execute(sqla.text(f"CREATE DATABASE {self.url.database}"))
+                connection.commit()
+        finally:
+            # do not keep idle connections to the server around
+            engine.dispose()
+
+    def _upsert_stmt(self, table: sqla.Table) -> sqla.sql.Insert:
+        stmt = insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=table.primary_key.columns,
+            set_={
+                c.name: stmt.excluded[c.name]
+                for c in table.columns
+                if not c.primary_key
+            },
+        )
 
     def _initialize_database(
         self, keys: Sequence[str], key_descriptions: Optional[Mapping[str, str]] = None
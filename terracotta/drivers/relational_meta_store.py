@@ -5,20 +5,36 @@ Base class for relational database drivers, using SQLAlchemy.
 
 import contextlib
 import functools
+import itertools
 import json
 import re
+import struct
+import threading
 import urllib.parse as urlparse
 from abc import ABC, abstractmethod
-from collections import OrderedDict
-from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple, Type, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 import numpy as np
 import sqlalchemy as sqla
 import terracotta
+from cachetools import TTLCache
 from sqlalchemy.engine.base import Connection
 from sqlalchemy.engine.url import URL
 from terracotta import exceptions
 from terracotta.drivers.base_classes import (
+    DatasetEntryType,
     KeysType,
     MetaStore,
     MultiValueKeysType,
@@ -26,6 +42,13 @@ from terracotta.drivers.base_classes import (
 )
 from terracotta.profile import trace
 
+try:
+    import orjson
+
+    has_orjson = True
+except ImportError:  # pragma: no cover
+    has_orjson = False
+
 _ERROR_ON_CONNECT = (
     "Could not connect to database. Make sure that the given path points "
     "to a valid Terracotta database, and that you ran driver.create()."
@@ -52,15 +75,39 @@ def convert_exceptions(
         raise exceptions.InvalidDatabaseError(error_message) from exception
 
 
+def json_dumps(obj: Any) -> str:
+    # writing is rare, so stick to the json module; orjson would silently turn
+    # NaN into null and reject integers that do not fit into 64 bits
+    return json.dumps(obj)
+
+
+def json_loads(json_string: Union[str, bytes]) -> Any:
+    if has_orjson:
+        try:
+            return orjson.loads(json_string)
+        except orjson.JSONDecodeError:
+            # might contain non-standard tokens like NaN written by the json module
+            pass
+    return json.loads(json_string)
+
+
+def pack_float32(values: Union[Sequence[float], np.ndarray]) -> bytes:
+    if isinstance(values, np.ndarray):
+        # no need to go through Python floats, arrays can be converted directly
+        return values.astype("float32", copy=False).tobytes()
+    return struct.pack(f"{len(values)}f", *values)
+
+
 @contextlib.contextmanager
-def try_database_operation(connection: Connection) -> Iterator:
+def try_database_operation(connection: Connection, commit: bool = True) -> Iterator:
     try:
         yield
     except:  # noqa: E722
         connection.rollback()
         raise
     else:
-        connection.commit()
+        if commit:
+            connection.commit()
 
 
 class RelationalMetaStore(MetaStore, ABC):
@@ -68,6 +115,7 @@ class RelationalMetaStore(MetaStore, ABC):
     SQL_DRIVER: str  # The actual database driver, eg pymysql, sqlite3, etc
     SQL_KEY_SIZE: int
     SQL_TIMEOUT_KEY: str
+    SQL_USE_CONNECTION_POOL: bool = True  # Whether to keep a pool of open connections
 
     SQLA_STRING: Any = sqla.types.String
     SQLA_METADATA_TYPE_LOOKUP: Dict[str, Any] = {
@@ -76,6 +124,10 @@ class RelationalMetaStore(MetaStore, ABC):
         "blob": sqla.types.LargeBinary,
     }
 
+    _KEY_PATTERN = re.compile(r"\A\w+\Z")
+    _INSERT_CHUNK_SIZE: int = 2000  # max number of rows per bulk insert statement
+    _DATASETS_CACHE_MAX_ENTRIES: int = 1000  # max number of datasets per cached query
+
     _METADATA_COLUMNS: Tuple[Tuple[str, str], ...] = (
         ("bounds_north", "real"),
         ("bounds_east", "real"),
@@ -91,10 +143,27 @@ class RelationalMetaStore(MetaStore, ABC):
         ("metadata", "text"),
     )
 
+    _METADATA_COLUMN_NAMES: Tuple[str, ...] = tuple(
+        name for name, _ in _METADATA_COLUMNS
+    )
+
+    _LITE_METADATA_COLUMNS: Tuple[str, ...] = tuple(
+        name for name, column_type in _METADATA_COLUMNS if column_type == "real"
+    )
+
     def __init__(self, path: str) -> None:
         settings = terracotta.get_settings()
         db_connection_timeout: int = settings.DB_CONNECTION_TIMEOUT
 
+        engine_kwargs: Dict[str, Any] = {}
+        if self.SQL_USE_CONNECTION_POOL:
+            # re-use open connections across requests instead of reconnecting every time
+            # replace connections before the server closes them for being idle
+            engine_kwargs.update(
+                pool_size=settings.DB_POOL_SIZE,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+            )
+
         self.url = self._parse_path(path)
         self.sqla_engine = sqla.create_engine(
             self.url,
@@ -103,18 +172,62 @@ class RelationalMetaStore(MetaStore, ABC):
             connect_args={self.SQL_TIMEOUT_KEY: db_connection_timeout},
             # automatically re-spawn stale connections, see terracotta#266
             pool_pre_ping=True,
+            **engine_kwargs,
         )
         self.sqla_metadata = sqla.MetaData()
 
-        self._db_keys: Optional[OrderedDict] = None
+        # key names and descriptions cannot change after creation, so they are cached
+        self._db_keys: Optional[Dict[str, str]] = None
+        self._db_key_names: Optional[Tuple[str, ...]] = None
+
+        # decoded metadata of recently accessed datasets, keyed by key values; entries
+        # expire so that changes made by other processes show up eventually
+        self._metadata_cache: Optional[TTLCache] = (
+            TTLCache(settings.METADATA_CACHE_SIZE, ttl=settings.METADATA_CACHE_TTL)
+            if settings.METADATA_CACHE_SIZE > 0 and settings.METADATA_CACHE_TTL > 0
+            else None
+        )
+        # scalar columns only, filled by get_metadata_lite; shares the lock above
+        self._metadata_lite_cache: Optional[TTLCache] = (
+            TTLCache(settings.METADATA_CACHE_SIZE, ttl=settings.METADATA_CACHE_TTL)
+            if self._metadata_cache is not None
+            else None
+        )
+        self._metadata_cache_lock = threading.Lock()
+
+        # results of recent get_datasets queries, keyed by query arguments; entries
+        # expire so that datasets inserted or deleted by other processes show up
+        self._datasets_cache: Optional[TTLCache] = (
+            TTLCache(settings.DATASETS_CACHE_SIZE, ttl=settings.DATASETS_CACHE_TTL)
+            if settings.DATASETS_CACHE_SIZE > 0 and settings.DATASETS_CACHE_TTL > 0
+            else None
+        )
+        self._datasets_cache_lock = threading.Lock()
 
-        self._connection: Optional[Connection] = None
-        self.connected: bool = False
+        # connection state is kept per thread, so threads sharing this instance
+        # never see each other's open connections
+        self._thread_local = threading.local()
         self.db_version_verified: bool = False
 
         # use normalized path to make sure username and password don't leak into __repr__
         super().__init__(self._normalize_path(path))
 
+    @property
+    def _connection(self) -> Optional[Connection]:
+        return getattr(self._thread_local, "connection", None)
+
+    @_connection.setter
+    def _connection(self, connection: Optional[Connection]) -> None:
+        self._thread_local.connection = connection
+
+    @property
+    def connected(self) -> bool:
+        return getattr(self._thread_local, "connected", False)
+
+    @connected.setter
+    def connected(self, connected: bool) -> None:
+        self._thread_local.connected = connected
+
     @classmethod
     def _parse_path(cls, connection_string: str) -> URL:
         if "//" not in connection_string:
@@ -142,7 +255,9 @@ class RelationalMetaStore(MetaStore, ABC):
         return url
 
     @contextlib.contextmanager
-    def connect(self, verify: bool = True) -> Iterator:
+    def connect(self, verify: bool = True, readonly: bool = False) -> Iterator:
+        # read-only operations skip the commit round trip; their transaction is
+        # rolled back when the connection is returned to the pool
         @convert_exceptions(_ERROR_ON_CONNECT, sqla.exc.OperationalError)
         def get_connection() -> Connection:
             return self.sqla_engine.connect().execution_options(
@@ -158,7 +273,7 @@ class RelationalMetaStore(MetaStore, ABC):
                     if verify:
                         self._connection_callback()
 
-                    with try_database_operation(self._connection):
+                    with try_database_operation(self._connection, commit=not readonly):
                         yield self._connection
             finally:
                 self._connection = None
@@ -166,24 +281,23 @@ class RelationalMetaStore(MetaStore, ABC):
         else:
             # re-use existing connection
             assert self._connection is not None
-            with try_database_operation(self._connection):
+            with try_database_operation(self._connection, commit=not readonly):
                 yield self._connection
 
     def _connection_callback(self) -> None:
-        if not self.db_version_verified:
-            # check for version compatibility
-            def version_tuple(version_string: str) -> Sequence[str]:
-                return version_string.split(".")
-
-            db_version = self.db_version
-            current_version = terracotta.__version__
-
-            if version_tuple(db_version)[:2] != version_tuple(current_version)[:2]:
-                raise exceptions.InvalidDatabaseError(
-                    f"Version conflict: database was created in v{db_version}, "
-                    f"but this is v{current_version}"
-                )
-            self.db_version_verified = True
+        if self.db_version_verified:
+            return
+
+        # check for version compatibility (major and minor version must match)
+        db_version = self.db_version
+        current_version = terracotta.__version__
+
+        if db_version.split(".", 2)[:2] != current_version.split(".", 2)[:2]:
+            raise exceptions.InvalidDatabaseError(
+                f"Version conflict: database was created in v{db_version}, "
+                f"but this is v{current_version}"
+            )
+        self.db_version_verified = True
 
     @property
     @convert_exceptions(_ERROR_ON_CONNECT)
@@ -194,7 +308,7 @@ class RelationalMetaStore(MetaStore, ABC):
         )
         stmt = sqla.select(terracotta_table.c.version)
 
-        with self.connect() as conn:
+        with self.connect(readonly=True) as conn:
             version = conn.execute(stmt).scalar()
 
         return str(version)
@@ -216,6 +330,7 @@ class RelationalMetaStore(MetaStore, ABC):
                 in the form of ``{key_name: description}``.
 
         """
+        self._db_keys = self._db_key_names = None
         self._create_database()
         self._initialize_database(keys, key_descriptions)
 
@@ -225,6 +340,12 @@ class RelationalMetaStore(MetaStore, ABC):
         # it may be created automatically on connection for some database vendors
         pass
 
+    @abstractmethod
+    def _upsert_stmt(self, table: sqla.Table) -> sqla.sql.Insert:
+        # Must return an INSERT statement for the given table that overwrites
+        # existing rows with the same primary key in place
+        pass
+
     def _initialize_database(
         self, keys: Sequence[str], key_descriptions: Optional[Mapping[str, str]] = None
     ) -> None:
@@ -238,7 +359,7 @@ class RelationalMetaStore(MetaStore, ABC):
                 "key description dict contains unknown keys"
             )
 
-        if not all(re.match(r"^\w+$", key) for key in keys):
+        if not all(self._KEY_PATTERN.match(key) for key in keys):
             raise exceptions.InvalidKeyError("key names must be alphanumeric")
 
         if any(key in self._RESERVED_KEYS for key in keys):
@@ -296,25 +417,94 @@ class RelationalMetaStore(MetaStore, ABC):
             )
 
     @convert_exceptions("Could not retrieve keys from database")
-    def get_keys(self) -> OrderedDict:
-        keys_table = sqla.Table(
-            "key_names", self.sqla_metadata, autoload_with=self.sqla_engine
-        )
-
-        with self.connect() as conn:
-            result = conn.execute(
-                sqla.select(
-                    keys_table.c["key_name"], keys_table.c["description"]
-                ).order_by(keys_table.c["idx"])
+    def get_keys(self) -> Dict[str, str]:
+        if self._db_keys is None:
+            keys_table = sqla.Table(
+                "key_names", self.sqla_metadata, autoload_with=self.sqla_engine
             )
-        return OrderedDict((row.key_name, row.description) for row in result.all())
+
+            with self.connect(readonly=True) as conn:
+                result = conn.execute(
+                    sqla.select(
+                        keys_table.c["key_name"], keys_table.c["description"]
+                    ).order_by(keys_table.c["idx"])
+                )
+            self._db_keys = {row.key_name: row.description for row in result.all()}
+
+        # return a copy so callers cannot modify the cache
+        return dict(self._db_keys)
 
     @property
     def key_names(self) -> Tuple[str, ...]:
         """Names of all keys defined by the database"""
-        if self._db_keys is None:
-            self._db_keys = self.get_keys()
-        return tuple(self._db_keys.keys())
+        if self._db_key_names is None:
+            self._db_key_names = tuple(self.get_keys().keys())
+        return self._db_key_names
+
+    # statements that only depend on the (fixed) key names are built once and re-used
+
+    @staticmethod
+    def _key_params(keys: KeysType) -> Dict[str, str]:
+        """Bind parameters for statements that match on all keys"""
+        return {f"_{key}": value for key, value in keys.items()}
+
+    def _match_all_keys(self, table: sqla.Table) -> List[sqla.sql.ColumnElement]:
+        return [table.c[key] == sqla.bindparam(f"_{key}") for key in self.key_names]
+
+    @functools.cached_property
+    def _select_metadata_stmt(self) -> sqla.sql.Select:
+        metadata_table = sqla.Table(
+            "metadata", self.sqla_metadata, autoload_with=self.sqla_engine
+        )
+        return sqla.select(
+            *[metadata_table.c[col] for col in self._METADATA_COLUMN_NAMES]
+        ).where(*self._match_all_keys(metadata_table))
+
+    @functools.cached_property
+    def _select_metadata_lite_stmt(self) -> sqla.sql.Select:
+        metadata_table = sqla.Table(
+            "metadata", self.sqla_metadata, autoload_with=self.sqla_engine
+        )
+        return sqla.select(
+            *[metadata_table.c[col] for col in self._LITE_METADATA_COLUMNS]
+        ).where(*self._match_all_keys(metadata_table))
+
+    @functools.cached_property
+    def _select_datasets_stmt(self) -> sqla.sql.Select:
+        datasets_table = sqla.Table(
+            "datasets", self.sqla_metadata, autoload_with=self.sqla_engine
+        )
+        return sqla.select(
+            *[datasets_table.c[key] for key in self.key_names], datasets_table.c.path
+        ).order_by(*datasets_table.c.values())
+
+    @functools.cached_property
+    def _insert_datasets_stmt(self) -> sqla.sql.Insert:
+        datasets_table = sqla.Table(
+            "datasets", self.sqla_metadata, autoload_with=self.sqla_engine
+        )
+        return self._upsert_stmt(datasets_table)
+
+    @functools.cached_property
+    def _insert_metadata_stmt(self) -> sqla.sql.Insert:
+        metadata_table = sqla.Table(
+            "metadata", self.sqla_metadata, autoload_with=self.sqla_engine
+        )
+        return self._upsert_stmt(metadata_table)
+
+    @functools.cached_property
+    def _delete_datasets_stmt(self) -> sqla.sql.Delete:
+        datasets_table = sqla.Table(
+            "datasets", self.sqla_metadata, autoload_with=self.sqla_engine
+        )
+        return datasets_table.delete().where(*self._match_all_keys(datasets_table))
+
+    @functools.cached_property
+    def _delete_metadata_stmt(self) -> sqla.sql.Delete:
+        metadata_table = sqla.Table(
+            "metadata", self.sqla_metadata, autoload_with=self.sqla_engine
+        )
+        return metadata_table.delete().where(*self._match_all_keys(metadata_table))
 
     @trace("get_datasets")
     @convert_exceptions("Could not retrieve datasets")
@@ -323,6 +513,8 @@ class RelationalMetaStore(MetaStore, ABC):
         where: Optional[MultiValueKeysType] = None,
         page: int = 0,
         limit: Optional[int] = None,
+        *,
+        use_cache: bool = True,
     ) -> Dict[Tuple[str, ...], str]:
         if where is None:
             where = {}
@@ -332,50 +524,179 @@ class RelationalMetaStore(MetaStore, ABC):
             for key, value in where.items()
         }
 
-        datasets_table = sqla.Table(
-            "datasets", self.sqla_metadata, autoload_with=self.sqla_engine
+        cache_key = (
+            tuple(sorted((key, tuple(values)) for key, values in where.items())),
+            page,
+            limit,
         )
-        stmt = (
-            datasets_table.select()
-            .where(
-                *[
-                    sqla.or_(*[datasets_table.c[column] == value for value in values])
-                    for column, values in where.items()
-                ]
-            )
-            .order_by(*datasets_table.c.values())
+
+        if use_cache and self._datasets_cache is not None:
+            with self._datasets_cache_lock:
+                cached = self._datasets_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+
+        stmt = self._select_datasets_stmt
+        datasets_columns = stmt.selected_columns
+        stmt = stmt.where(
+            *[datasets_columns[column].in_(values) for column, values in where.items()]
         )
 
         if limit is not None:
             stmt = stmt.limit(limit).offset(page * limit if limit is not None else None)
+        else:
+            # result may be large, so stream rows instead of buffering all of them
+            stmt = stmt.execution_options(stream_results=True)
 
-        with self.connect() as conn:
-            result = conn.execute(stmt).all()
+        with self.connect(readonly=True) as conn:
+            result = conn.execute(stmt)
+            # rows are (*keys, path)
+            datasets = {tuple(row[:-1]): row[-1] for row in result}
 
-        def keytuple(row: sqla.engine.row.Row) -> Tuple[str, ...]:
-            return tuple(getattr(row, key) for key in self.key_names)
+        if self._datasets_cache is not None:
+            # only keep small results around, listing a whole database could be huge;
+            # empty results are not cached so that new datasets are found right away
+            if 0 < len(datasets) <= self._DATASETS_CACHE_MAX_ENTRIES:
+                with self._datasets_cache_lock:
+                    self._datasets_cache[cache_key] = dict(datasets)
 
-        datasets = {keytuple(row): row.path for row in result}
         return datasets
 
     @trace("get_metadata")
     @convert_exceptions("Could not retrieve metadata")
     def get_metadata(self, keys: KeysType) -> Optional[Dict[str, Any]]:
-        metadata_table = sqla.Table(
-            "metadata", self.sqla_metadata, autoload_with=self.sqla_engine
-        )
-        stmt = metadata_table.select().where(
-            *[metadata_table.c[key] == value for key, value in keys.items()]
-        )
+        cache_key = tuple(keys[key] for key in self.key_names)
+
+        row = None
+        if self._metadata_cache is not None:
+            with self._metadata_cache_lock:
+                row = self._metadata_cache.get(cache_key)
+
+        if row is None:
+            with self.connect(readonly=True) as conn:
+                row = conn.execute(
+                    self._select_metadata_stmt, self._key_params(keys)
+                ).first()
+            if not row:
+                return None
+
+            if self._metadata_cache is not None:
+                # rows are immutable and cheap to decode, so each call returns
+                # fresh objects that callers are free to modify
+                with self._metadata_cache_lock:
+                    self._metadata_cache[cache_key] = tuple(row)
+
+        return self._decode_data(dict(zip(self._METADATA_COLUMN_NAMES, row)))
+
+    def _invalidate_caches(self, keys: Optional[Iterable[KeysType]] = None) -> None:
+        """Remove given datasets from in-memory caches (or everything if keys is None)"""
+        if self._datasets_cache is not None:
+            # any query result may contain the given datasets
+            with self._datasets_cache_lock:
+                self._datasets_cache.clear()
+
+        if self._metadata_cache is None or self._metadata_lite_cache is None:
+            return
+
+        with self._metadata_cache_lock:
+            if keys is None:
+                self._metadata_cache.clear()
+                self._metadata_lite_cache.clear()
+                return
+
+            key_names = self.key_names
+            for dataset_keys in keys:
+                cache_key = tuple(dataset_keys[key] for key in key_names)
+                self._metadata_cache.pop(cache_key, None)
+                self._metadata_lite_cache.pop(cache_key, None)
+
+    @trace("get_metadata_lite")
+    @convert_exceptions("Could not retrieve metadata")
+    def get_metadata_lite(self, keys: KeysType) -> Optional[Dict[str, Any]]:
+        cache_key = tuple(keys[key] for key in self.key_names)
+
+        if self._metadata_cache is not None and self._metadata_lite_cache is not None:
+            with self._metadata_cache_lock:
+                full_row = self._metadata_cache.get(cache_key)
+                lite_row = self._metadata_lite_cache.get(cache_key)
+            if full_row is not None:
+                return self._decode_lite_data(
+                    dict(zip(self._METADATA_COLUMN_NAMES, full_row))
+                )
+            if lite_row is not None:
+                return self._decode_lite_data(
+                    dict(zip(self._LITE_METADATA_COLUMNS, lite_row))
+                )
 
-        with self.connect() as conn:
-            row = conn.execute(stmt).first()
+        # skips the text and blob columns, which may live in overflow pages
+        with self.connect(readonly=True) as conn:
+            row = conn.execute(
+                self._select_metadata_lite_stmt, self._key_params(keys)
+            ).first()
         if not row:
             return None
 
-        data_columns, _ = zip(*self._METADATA_COLUMNS)
-        encoded_data = {col: getattr(row, col) for col in self.key_names + data_columns}
-        return self._decode_data(encoded_data)
+        if self._metadata_lite_cache is not None:
+            with self._metadata_cache_lock:
+                self._metadata_lite_cache[cache_key] = tuple(row)
+
+        return self._decode_lite_data(dict(zip(self._LITE_METADATA_COLUMNS, row)))
+
+    @trace("get_metadata_many")
+    @convert_exceptions("Could not retrieve metadata")
+    def get_metadata_many(
+        self, keys: Sequence[KeysType]
+    ) -> List[Optional[Dict[str, Any]]]:
+        if not keys:
+            return []
+
+        key_names = self.key_names
+
+        def keytuple(dataset_keys: KeysType) -> Tuple[str, ...]:
+            return tuple(dataset_keys[key] for key in key_names)
+
+        requested = [keytuple(k) for k in keys]
+        # encoded metadata rows, decoded separately for every requested dataset
+        rows: Dict[Tuple[str, ...], Tuple[Any, ...]] = {}
+
+        if self._metadata_cache is not None:
+            with self._metadata_cache_lock:
+                for cache_key in requested:
+                    cached = self._metadata_cache.get(cache_key)
+                    if cached is not None:
+                        rows[cache_key] = cached
+
+        missing = list(dict.fromkeys(k for k in requested if k not in rows))
+
+        if missing:
+            metadata_table = sqla.Table(
+                "metadata", self.sqla_metadata, autoload_with=self.sqla_engine
+            )
+            key_columns = [metadata_table.c[key] for key in key_names]
+            data_columns = self._METADATA_COLUMN_NAMES
+
+            stmt = sqla.select(
+                *key_columns, *[metadata_table.c[col] for col in data_columns]
+            ).where(sqla.tuple_(*key_columns).in_(missing))
+
+            with self.connect(readonly=True) as conn:
+                result = conn.execute(stmt).all()
+
+            # rows are (*keys, *data_columns)
+            num_keys = len(key_names)
+            fetched = {tuple(row[:num_keys]): tuple(row[num_keys:]) for row in result}
+
+            if self._metadata_cache is not None:
+                with self._metadata_cache_lock:
+                    self._metadata_cache.update(fetched)
+
+            rows.update(fetched)
+
+        data_columns = self._METADATA_COLUMN_NAMES
+        return [
+            self._decode_data(dict(zip(data_columns, rows[k]))) if k in rows else None
+            for k in requested
+        ]
 
     @trace("insert")
     @requires_writable
@@ -383,67 +704,64 @@ class RelationalMetaStore(MetaStore, ABC):
     def insert(
         self, keys: KeysType, path: str, *, metadata: Optional[Mapping[str, Any]] = None
     ) -> None:
-        datasets_table = sqla.Table(
-            "datasets", self.sqla_metadata, autoload_with=self.sqla_engine
-        )
-        metadata_table = sqla.Table(
-            "metadata", self.sqla_metadata, autoload_with=self.sqla_engine
-        )
+        self._insert_many([(keys, path, metadata)])
+
+    @trace("insert_many")
+    @requires_writable
+    @convert_exceptions("Could not write to database")
+    def insert_many(self, datasets: Iterable[DatasetEntryType]) -> None:
+        self._insert_many(datasets)
+
+    def _insert_many(self, datasets: Iterable[DatasetEntryType]) -> None:
+        datasets = iter(datasets)
+        inserted_keys: List[KeysType] = []
 
         with self.connect() as conn:
-            conn.execute(
-                datasets_table.delete().where(
-                    *[
-                        datasets_table.c[column] == value
-                        for column, value in keys.items()
-                    ]
-                )
-            )
-            conn.execute(datasets_table.insert().values(**keys, path=path))
+            # insert in chunks to bound memory usage and statement size
+            while True:
+                chunk = list(itertools.islice(datasets, self._INSERT_CHUNK_SIZE))
+                if not chunk:
+                    break
 
-            if metadata is not None:
-                encoded_data = self._encode_data(metadata)
+                inserted_keys.extend(keys for keys, _, _ in chunk)
+
+                # upserts overwrite existing rows in place instead of deleting them first
                 conn.execute(
-                    metadata_table.delete().where(
-                        *[
-                            metadata_table.c[column] == value
-                            for column, value in keys.items()
-                        ]
-                    )
+                    self._insert_datasets_stmt,
+                    [dict(**keys, path=path) for keys, path, _ in chunk],
                 )
-                conn.execute(metadata_table.insert().values(**keys, **encoded_data))
+
+                metadata_rows = [
+                    (keys, self._encode_data(metadata))
+                    for keys, _, metadata in chunk
+                    if metadata is not None
+                ]
+
+                if metadata_rows:
+                    conn.execute(
+                        self._insert_metadata_stmt,
+                        [dict(**keys, **encoded) for keys, encoded in metadata_rows],
+                    )
+
+        self._invalidate_caches(inserted_keys)
 
     @trace("delete")
     @requires_writable
     @convert_exceptions("Could not write to database")
     def delete(self, keys: KeysType) -> None:
-        if not self.get_datasets(keys):
-            raise exceptions.DatasetNotFoundError(f"No dataset found with keys {keys}")
-
-        datasets_table = sqla.Table(
-            "datasets", self.sqla_metadata, autoload_with=self.sqla_engine
-        )
-        metadata_table = sqla.Table(
-            "metadata", self.sqla_metadata, autoload_with=self.sqla_engine
-        )
+        key_params = self._key_params(keys)
 
         with self.connect() as conn:
-            conn.execute(
-                datasets_table.delete().where(
-                    *[
-                        datasets_table.c[column] == value
-                        for column, value in keys.items()
-                    ]
+            # both deletes run in the same transaction, so this is rolled back if
+            # the dataset does not exist
+            result = conn.execute(self._delete_datasets_stmt, key_params)
+            if result.rowcount == 0:
+                raise exceptions.DatasetNotFoundError(
+                    f"No dataset found with keys {keys}"
                 )
-            )
-            conn.execute(
-                metadata_table.delete().where(
-                    *[
-                        metadata_table.c[column] == value
-                        for column, value in keys.items()
-                    ]
-                )
-            )
+            conn.execute(self._delete_metadata_stmt, key_params)
+
+        self._invalidate_caches([keys])
 
     @staticmethod
     def _encode_data(decoded: Mapping[str, Any]) -> Dict[str, Any]:
@@ -453,17 +771,30 @@ class RelationalMetaStore(MetaStore, ABC):
             "bounds_east": decoded["bounds"][1],
             "bounds_south": decoded["bounds"][2],
             "bounds_west": decoded["bounds"][3],
-            "convex_hull": json.dumps(decoded["convex_hull"]),
+            "convex_hull": json_dumps(decoded["convex_hull"]),
             "valid_percentage": decoded["valid_percentage"],
             "min": decoded["range"][0],
             "max": decoded["range"][1],
             "mean": decoded["mean"],
             "stdev": decoded["stdev"],
-            "percentiles": np.array(decoded["percentiles"], dtype="float32").tobytes(),
-            "metadata": json.dumps(decoded["metadata"]),
+            "percentiles": pack_float32(decoded["percentiles"]),
+            "metadata": json_dumps(decoded["metadata"]),
         }
         return encoded
 
+    @staticmethod
+    def _decode_lite_data(encoded: Mapping[str, Any]) -> Dict[str, Any]:
+        """Transform scalar columns from database format to internal representation"""
+        return {
+            "bounds": tuple(
+                [encoded[f"bounds_{d}"] for d in ("north", "east", "south", "west")]
+            ),
+            "valid_percentage": encoded["valid_percentage"],
+            "range": (encoded["min"], encoded["max"]),
+            "mean": encoded["mean"],
+            "stdev": encoded["stdev"],
+        }
+
     @staticmethod
     def _decode_data(encoded: Mapping[str, Any]) -> Dict[str, Any]:
         """Transform from database format to internal representation"""
@@ -471,14 +802,16 @@ class RelationalMetaStore(MetaStore, ABC):
             "bounds": tuple(
                 [encoded[f"bounds_{d}"] for d in ("north", "east", "south", "west")]
             ),
-            "convex_hull": json.loads(encoded["convex_hull"]),
+            "convex_hull": json_loads(encoded["convex_hull"]),
             "valid_percentage": encoded["valid_percentage"],
             "range": (encoded["min"], encoded["max"]),
             "mean": encoded["mean"],
             "stdev": encoded["stdev"],
-            "percentiles": np.frombuffer(
-                encoded["percentiles"], dtype="float32"
-            ).tolist(),
-            "metadata": json.loads(encoded["metadata"]),
+            "percentiles": list(
+                struct.unpack(
+                    f"{len(encoded['percentiles']) // 4}f", encoded["percentiles"]
+                )
+            ),
+            "metadata": json_loads(encoded["metadata"]),
         }
         return decoded
@@ -7,6 +7,8 @@ import os
 from pathlib import Path
 from typing import Union
 
+import sqlalchemy as sqla
+from sqlalchemy.dialects.sqlite import insert
 from terracotta.drivers.relational_meta_store import RelationalMetaStore
 
 
@@ -45,6 +47,7 @@ class SQLiteMetaStore(RelationalMetaStore):
     SQL_DRIVER = "pysqlite"
     SQL_KEY_SIZE = 256
     SQL_TIMEOUT_KEY = "timeout"
+    SQL_USE_CONNECTION_POOL = False  # connecting to a local file is cheap
 
     def __init__(self, path: Union[str, Path]) -> None:
         """Initialize the SQLiteDriver.
@@ -70,3 +73,15 @@ class SQLiteMetaStore(RelationalMetaStore):
         so no need to do anything here
         """
         pass
+
+    def _upsert_stmt(self, table: sqla.Table) -> sqla.sql.Insert:
+        # requires SQLite >= 3.24
+        stmt = insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=table.primary_key.columns,
+            set_={
+                c.name: stmt.excluded[c.name]
+                for c in table.columns
+                if not c.primary_key
+            },
+        )
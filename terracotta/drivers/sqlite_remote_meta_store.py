@@ -134,6 +134,7 @@ class RemoteSQLiteMetaStore(SQLiteMetaStore):
             logger.debug("Remote database cache expired, re-downloading")
             _update_from_s3(remote_path, local_path)
             self._last_updated = time.time()
+            self._invalidate_caches()
 
     def _connection_callback(self) -> None:
         self._update_db(self._remote_path, self._local_path)
@@ -3,12 +3,14 @@
 The driver to interact with.
 """
 
+import concurrent.futures
 import contextlib
-from collections import OrderedDict
+import itertools
 from typing import (
     Any,
     Collection,
     Dict,
+    Iterable,
     List,
     Mapping,
     Optional,
@@ -21,6 +23,7 @@ from typing import (
 import terracotta
 from terracotta import exceptions
 from terracotta.drivers.base_classes import (
+    LITE_METADATA_KEYS,
     KeysType,
     MetaStore,
     MultiValueKeysType,
@@ -43,6 +46,11 @@ class TerracottaDriver:
     Do not instantiate directly, use :func:`terracotta.get_driver` instead.
     """
 
+    # max. number of datasets to compute metadata for at once
+    _METADATA_WORKERS: int = 4
+    # number of datasets to compute metadata for before writing them to the meta store
+    _INSERT_CHUNK_SIZE: int = 100
+
     def __init__(self, meta_store: MetaStore, raster_store: RasterStore) -> None:
         self.meta_store = meta_store
         self.raster_store = raster_store
@@ -117,13 +125,13 @@ class TerracottaDriver:
         """
         return self.meta_store.connect(verify=verify)
 
-    def get_keys(self) -> OrderedDict:
+    def get_keys(self) -> Dict[str, str]:
         """Get all known keys and their fulltext descriptions.
 
         Returns:
 
-            An :class:`~collections.OrderedDict` in the form
-            ``{key_name: key_description}``
+            A :class:`dict` in the form ``{key_name: key_description}``,
+            ordered like the keys of the database
 
         """
         return self.meta_store.get_keys()
@@ -178,12 +186,15 @@ class TerracottaDriver:
         """
         keys = self._standardize_keys(keys)
 
-        with self.meta_store.connect():
-            metadata = self.meta_store.get_metadata(keys)
+        # only hold a connection for lazy loading, cached metadata needs none
+        metadata = self.meta_store.get_metadata(keys)
 
-            if metadata is None:
-                # metadata is not computed yet, trigger lazy loading
-                dataset = self.get_datasets(keys)
+        if metadata is None:
+            with self.meta_store.connect():
+                # metadata is not computed yet, trigger lazy loading;
+                # bypass the cache so that datasets deleted elsewhere are not
+                # written back by the insert below
+                dataset = self.meta_store.get_datasets(keys, use_cache=False)
                 if not dataset:
                     raise exceptions.DatasetNotFoundError("No dataset found")
 
@@ -205,6 +216,71 @@ class TerracottaDriver:
 
         return metadata
 
+    def get_metadata_lite(self, keys: ExtendedKeysType) -> Dict[str, Any]:
+        """Return scalar metadata for given keys.
+
+        Like :meth:`get_metadata`, but only returns ``range``, ``bounds``,
+        ``valid_percentage``, ``mean``, and ``stdev``. Use this where the larger
+        metadata fields are not needed.
+
+        Arguments:
+
+            keys: Keys of the requested dataset. Can either be given as a sequence of key values,
+                or as a mapping ``{key_name: key_value}``.
+
+        """
+        keys = self._standardize_keys(keys)
+
+        metadata = self.meta_store.get_metadata_lite(keys)
+
+        if metadata is None:
+            # trigger lazy loading
+            full_metadata = self.get_metadata(keys)
+            metadata = {key: full_metadata[key] for key in LITE_METADATA_KEYS}
+
+        return metadata
+
+    def get_metadata_many(
+        self, keys: Sequence[ExtendedKeysType]
+    ) -> List[Dict[str, Any]]:
+        """Return all stored metadata for several datasets at once.
+
+        This is equivalent to calling :meth:`get_metadata` for every dataset, but
+        retrieves all metadata that is already computed in a single batch.
+
+        Arguments:
+
+            keys: Sequence of dataset keys. Each entry can either be given as a sequence of
+                key values, or as a mapping ``{key_name: key_value}``.
+
+        Returns:
+
+            A :class:`list` of metadata dicts (as returned by :meth:`get_metadata`),
+            in the same order as ``keys``.
+
+        """
+        standardized_keys = [self._standardize_keys(k) for k in keys]
+
+        metadata = self.meta_store.get_metadata_many(standardized_keys)
+
+        # only hold a connection for lazy loading, cached metadata needs none
+        needs_lazy_loading = any(m is None for m in metadata)
+
+        with (
+            self.meta_store.connect()
+            if needs_lazy_loading
+            else contextlib.nullcontext()
+        ):
+            # trigger lazy loading for datasets without metadata
+            return [
+                (
+                    dataset_metadata
+                    if dataset_metadata is not None
+                    else self.get_metadata(dataset_keys)
+                )
+                for dataset_metadata, dataset_keys in zip(metadata, standardized_keys)
+            ]
+
     def insert(
         self,
         keys: ExtendedKeysType,
@@ -236,6 +312,53 @@ class TerracottaDriver:
 
         self.meta_store.insert(keys=keys, path=override_path or path, metadata=metadata)
 
+    def insert_many(
+        self,
+        datasets: Iterable[Tuple[ExtendedKeysType, str, Optional[Mapping[str, Any]]]],
+        *,
+        skip_metadata: bool = False,
+    ) -> None:
+        """Register several datasets at once. Used to populate meta store in bulk.
+
+        Depending on the meta store, this is considerably faster than calling
+        :meth:`insert` repeatedly, since datasets are written in batches.
+
+        Arguments:
+
+            datasets: Iterable of ``(keys, path, metadata)`` tuples. Keys and metadata
+                have the same meaning as for :meth:`insert`.
+            skip_metadata: If True, will skip metadata computation for datasets that
+                have no metadata given (will be computed during first request instead).
+
+        """
+        standardized_datasets = (
+            (self._standardize_keys(keys), path, metadata)
+            for keys, path, metadata in datasets
+        )
+
+        def ensure_metadata(
+            entry: Tuple[KeysType, str, Optional[Mapping[str, Any]]],
+        ) -> Tuple[KeysType, str, Optional[Mapping[str, Any]]]:
+            keys, path, metadata = entry
+            if metadata is None and not skip_metadata:
+                metadata = self.compute_metadata(path)
+            return keys, path, metadata
+
+        # raster I/O releases the GIL, so computing metadata in threads pays off
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._METADATA_WORKERS
+        ) as executor:
+            # work in chunks, so only a bounded number of computed metadata
+            # dicts is held in memory at any time
+            while True:
+                chunk = list(
+                    itertools.islice(standardized_datasets, self._INSERT_CHUNK_SIZE)
+                )
+                if not chunk:
+                    break
+
+                self.meta_store.insert_many(executor.map(ensure_metadata, chunk))
+
     def delete(self, keys: ExtendedKeysType) -> None:
         """Remove a dataset from the meta store.
 
@@ -277,7 +400,8 @@ class TerracottaDriver:
 
             Requested tile as :class:`~numpy.ma.MaskedArray` of shape ``tile_size`` if
             ``asynchronous=False``, otherwise a :class:`~concurrent.futures.Future` containing
-            the result.
+            the result. Tiles may be shared with the raster cache, so data and mask can be
+            read-only; copy the result before modifying it in place.
 
         """
         path = squeeze(self.get_datasets(keys).values())
@@ -348,15 +472,17 @@ class TerracottaDriver:
         keys: Union[ExtendedKeysType, Optional[MultiValueKeysType]],
         requires_all_keys: bool = True,
     ) -> Dict[str, Any]:
-        if requires_all_keys and (keys is None or len(keys) != len(self.key_names)):
+        key_names = self.key_names
+
+        if requires_all_keys and (keys is None or len(keys) != len(key_names)):
             raise exceptions.InvalidKeyError(
-                f"Got wrong number of keys (available keys: {self.key_names})"
+                f"Got wrong number of keys (available keys: {key_names})"
             )
 
         if isinstance(keys, Mapping):
             keys = dict(keys.items())
         elif isinstance(keys, Sequence):
-            keys = dict(zip(self.key_names, keys))
+            keys = dict(zip(key_names, keys))
         elif keys is None:
             keys = {}
         else:
@@ -364,10 +490,10 @@ class TerracottaDriver:
                 "Encountered unknown key type, expected Mapping or Sequence"
             )
 
-        unknown_keys = set(keys) - set(self.key_names)
+        unknown_keys = keys.keys() - key_names
         if unknown_keys:
             raise exceptions.InvalidKeyError(
-                f"Encountered unrecognized keys {unknown_keys} (available keys: {self.key_names})"
+                f"Encountered unrecognized keys {unknown_keys} (available keys: {key_names})"
             )
 
         return keys
@@ -7,6 +7,7 @@ from typing import Mapping, Sequence, Dict, Any, Union, List, Optional
 from collections import OrderedDict
 
 from terracotta import get_settings, get_driver
+from terracotta.drivers.base_classes import LITE_METADATA_KEYS
 from terracotta.exceptions import InvalidArgumentsError
 from terracotta.profile import trace
 
@@ -32,7 +33,14 @@ def metadata(
     """Returns all metadata for a single dataset"""
     settings = get_settings()
     driver = get_driver(settings.DRIVER_PATH, provider=settings.DRIVER_PROVIDER)
-    metadata = filter_metadata(driver.get_metadata(keys), columns)
+
+    if columns and all(c in LITE_METADATA_KEYS for c in columns):
+        # no need to retrieve and decode the larger metadata fields
+        dataset_metadata = driver.get_metadata_lite(keys)
+    else:
+        dataset_metadata = driver.get_metadata(keys)
+
+    metadata = filter_metadata(dataset_metadata, columns)
     metadata["keys"] = OrderedDict(zip(driver.key_names, keys))
     return metadata
 
@@ -53,10 +61,9 @@ def multiple_metadata(
         )
 
     out = []
-    with driver.connect():
-        for dataset in datasets:
-            metadata = filter_metadata(driver.get_metadata(dataset), columns)
-            metadata["keys"] = OrderedDict(zip(key_names, dataset))
-            out.append(metadata)
+    for dataset, dataset_metadata in zip(datasets, driver.get_metadata_many(datasets)):
+        metadata = filter_metadata(dataset_metadata, columns)
+        metadata["keys"] = OrderedDict(zip(key_names, dataset))
+        out.append(metadata)
 
     return out
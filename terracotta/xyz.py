@@ -33,7 +33,7 @@ def get_tile_data(
         )
 
     # determine bounds for given tile
-    metadata = driver.get_metadata(keys)
+    metadata = driver.get_metadata_lite(keys)
     wgs_bounds = metadata["bounds"]
 
     tile_x, tile_y, tile_z = tile_xyz
@@ -44,6 +44,23 @@ def test_normalize_filepath(provider, tmpdir):
         assert driver._normalize_path(p) == first_path
 
 
+def test_get_driver_relative_path(tmpdir, monkeypatch):
+    from terracotta import drivers
+
+    dir_1 = tmpdir.mkdir("dir_1")
+    dir_2 = tmpdir.mkdir("dir_2")
+
+    monkeypatch.chdir(dir_1)
+    db_1 = drivers.get_driver("foo.tc", provider="sqlite")
+    assert drivers.get_driver("foo.tc", provider="sqlite") is db_1
+
+    # same relative path in another working directory is a different database
+    monkeypatch.chdir(dir_2)
+    db_2 = drivers.get_driver("foo.tc", provider="sqlite")
+    assert db_2 is not db_1
+    assert db_2.meta_store.path == str(dir_2.join("foo.tc"))
+
+
 @pytest.mark.parametrize("provider", ["mysql", "sqlite-remote"])
 def test_normalize_url(provider):
     from terracotta.drivers import load_driver
@@ -67,6 +84,29 @@ def test_normalize_url(provider):
         assert driver._normalize_path(p) == first_path
 
 
+@pytest.mark.parametrize("sql_driver", ["pymysql", "mysqldb"])
+def test_normalize_url_mysql_driver(sql_driver, monkeypatch):
+    from terracotta.drivers import load_driver
+
+    driver = load_driver("mysql")
+    monkeypatch.setattr(driver, "SQL_DRIVER", sql_driver)
+
+    assert (
+        driver._normalize_path("user@test.example.com/foo")
+        == "mysql://test.example.com:3306/foo"
+    )
+
+
+def test_mysql_prefers_mysqlclient():
+    pytest.importorskip("MySQLdb")
+
+    from terracotta.drivers import load_driver
+
+    meta_store = load_driver("mysql")("mysql://localhost/tc")
+    assert meta_store.url.drivername == "mysql+mysqldb"
+    assert meta_store.path == "mysql://localhost:3306/tc"
+
+
 @pytest.mark.parametrize("provider", ["mysql"])
 def test_parse_connection_string_with_invalid_schemes(provider):
     from terracotta import drivers
@@ -116,17 +156,42 @@ def test_creation_descriptions(driver_path, provider):
     assert db.get_keys()["some"] == key_desc["some"]
 
 
+@pytest.mark.parametrize("provider", TESTABLE_DRIVERS)
+def test_get_keys_cached(driver_path, provider, monkeypatch):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+    db.create(keys)
+
+    db_keys = db.get_keys()
+    assert list(db_keys) == list(keys)
+
+    # cached keys are not affected by modifying the returned dict
+    db_keys["foo"] = "bar"
+    assert list(db.get_keys()) == list(keys)
+
+    # no database access needed after first call
+    def connect(*args, **kwargs):
+        raise AssertionError("should not connect")
+
+    with monkeypatch.context() as m:
+        m.setattr(db.meta_store, "connect", connect)
+        assert list(db.get_keys()) == list(keys)
+        assert db.key_names == keys
+
+
 @pytest.mark.parametrize("provider", TESTABLE_DRIVERS)
 def test_creation_invalid(driver_path, provider):
     from terracotta import drivers, exceptions
 
     db = drivers.get_driver(driver_path, provider=provider)
-    keys = ("invalid keyname",)
 
-    with pytest.raises(exceptions.InvalidKeyError) as exc:
-        db.create(keys)
+    for keys in [("invalid keyname",), ("trailing_newline\n",)]:
+        with pytest.raises(exceptions.InvalidKeyError) as exc:
+            db.create(keys)
 
-    assert "must be alphanumeric" in str(exc.value)
+        assert "must be alphanumeric" in str(exc.value)
 
 
 @pytest.mark.parametrize("provider", TESTABLE_DRIVERS)
@@ -196,6 +261,152 @@ def test_broken_connection(driver_path, provider):
         db.get_keys()
 
 
+@pytest.mark.parametrize("provider", TESTABLE_DRIVERS)
+def test_connection_per_thread(driver_path, provider):
+    import threading
+
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+    db.create(keys)
+
+    connected_in_thread = []
+
+    def worker():
+        connected_in_thread.append(db.meta_store.connected)
+
+    with db.connect():
+        assert db.meta_store.connected
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    assert connected_in_thread == [False]
+    assert not db.meta_store.connected
+
+
+@pytest.mark.parametrize("provider", TESTABLE_DRIVERS)
+def test_no_commit_on_read(driver_path, provider, monkeypatch):
+    from sqlalchemy.engine import Connection
+
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+    db.create(keys)
+
+    commits = []
+    original_commit = Connection.commit
+
+    def commit(self):
+        commits.append(self)
+        return original_commit(self)
+
+    monkeypatch.setattr(Connection, "commit", commit)
+
+    db.get_datasets()
+    db.meta_store.get_metadata({"some": "foo", "keynames": "bar"})
+    assert not commits
+
+    db.insert(["foo", "bar"], "path", skip_metadata=True)
+    assert commits
+
+
+@pytest.mark.parametrize("provider", TESTABLE_DRIVERS)
+def test_datasets_cache(driver_path, provider, monkeypatch):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+    db.create(keys)
+
+    db.insert(["some", "value"], "path", skip_metadata=True)
+    datasets = db.get_datasets({"some": "some"})
+    assert datasets == {("some", "value"): "path"}
+
+    # modifying the result does not affect the cache
+    datasets.clear()
+    assert db.get_datasets({"some": "some"}) == {("some", "value"): "path"}
+
+    # inserting and deleting invalidates the cache
+    db.insert(["some", "other_value"], "other_path", skip_metadata=True)
+    assert len(db.get_datasets({"some": "some"})) == 2
+
+    db.delete(["some", "value"])
+    assert db.get_datasets({"some": "some"}) == {("some", "other_value"): "other_path"}
+
+    # cached queries do not hit the database
+    def connect(*args, **kwargs):
+        raise AssertionError("should not connect")
+
+    with monkeypatch.context() as m:
+        m.setattr(db.meta_store, "connect", connect)
+        assert db.get_datasets({"some": "some"}) == {
+            ("some", "other_value"): "other_path"
+        }
+
+
+def test_datasets_cache_other_instance(tmpdir):
+    from terracotta import drivers
+
+    dbfile = tmpdir.join("test.sqlite")
+    meta_store_class = drivers.load_driver("sqlite")
+    store_a = meta_store_class(str(dbfile))
+    store_a.create(["some"])
+    store_b = meta_store_class(str(dbfile))
+
+    # empty results are not cached
+    assert store_a.get_datasets({"some": "value"}) == {}
+    assert store_a.get_datasets() == {}
+
+    store_b.insert({"some": "value"}, "path")
+    assert store_a.get_datasets({"some": "value"}) == {("value",): "path"}
+    assert store_a.get_datasets() == {("value",): "path"}
+
+
+def test_lazy_loading_ignores_datasets_cache(tmpdir, raster_file):
+    from terracotta import drivers, exceptions
+    from terracotta.drivers.geotiff_raster_store import GeoTiffRasterStore
+
+    dbfile = tmpdir.join("test.sqlite")
+    meta_store_class = drivers.load_driver("sqlite")
+    db_a = drivers.TerracottaDriver(meta_store_class(str(dbfile)), GeoTiffRasterStore())
+    db_a.create(["some"])
+    db_b = drivers.TerracottaDriver(meta_store_class(str(dbfile)), GeoTiffRasterStore())
+
+    db_b.insert(["value"], str(raster_file), skip_metadata=True)
+    assert db_a.get_datasets({"some": "value"}) == {("value",): str(raster_file)}
+
+    # deleted by another process while still in the datasets cache of db_a
+    db_b.delete(["value"])
+
+    with pytest.raises(exceptions.DatasetNotFoundError):
+        db_a.get_metadata_lite(["value"])
+
+    # lazy loading did not bring the dataset back
+    assert db_b.get_datasets() == {}
+
+
+def test_datasets_cache_ttl(monkeypatch):
+    with monkeypatch.context() as m:
+        m.setenv("TC_DATASETS_CACHE_TTL", "3")
+
+        from terracotta import drivers, update_settings
+
+        update_settings()
+
+        meta_store = drivers.load_driver("sqlite")("test.sqlite")
+        assert meta_store._datasets_cache.ttl == 3
+
+        m.setenv("TC_DATASETS_CACHE_TTL", "0")
+        update_settings()
+
+        meta_store = drivers.load_driver("sqlite")("test.sqlite")
+        assert meta_store._datasets_cache is None
+
+
 @pytest.mark.parametrize("provider", TESTABLE_DRIVERS)
 def test_repr(driver_path, provider):
     from terracotta import drivers
@@ -292,3 +503,65 @@ def test_use_credentials_from_settings(driver_path, provider, monkeypatch):
             db = drivers.get_driver(driver_path_without_credentials, provider)
             assert db.meta_store.url.username == "foo"
             assert db.meta_store.url.password == "bar"
+
+
+@pytest.mark.parametrize("provider", ["mysql", "postgresql"])
+def test_connection_pool_size(provider, monkeypatch):
+    with monkeypatch.context() as m:
+        m.setenv("TC_DB_POOL_SIZE", "3")
+
+        from terracotta import drivers, update_settings
+
+        update_settings()
+
+        meta_store = drivers.load_driver(provider)(f"{provider}://localhost/tc")
+        assert meta_store.sqla_engine.pool.size() == 3
+
+
+@pytest.mark.parametrize("provider", ["mysql", "postgresql"])
+def test_connection_pool_recycle(provider, monkeypatch):
+    with monkeypatch.context() as m:
+        m.setenv("TC_DB_POOL_RECYCLE", "600")
+
+        from terracotta import drivers, update_settings
+
+        update_settings()
+
+        meta_store = drivers.load_driver(provider)(f"{provider}://localhost/tc")
+        assert meta_store.sqla_engine.pool._recycle == 600
+
+
+def test_json_encoding():
+    import math
+
+    from terracotta.drivers.relational_meta_store import json_dumps, json_loads
+
+    data = {"a": [1, 2.5, "foo"], "b": {"c": None}}
+    assert json_loads(json_dumps(data)) == data
+
+    # written by stdlib json in older versions
+    assert math.isnan(json_loads('{"a": NaN}')["a"])
+
+    # non-finite values survive a round trip
+    out = json_loads(json_dumps({"a": math.nan, "b": math.inf, "c": -math.inf}))
+    assert math.isnan(out["a"])
+    assert out["b"] == math.inf
+    assert out["c"] == -math.inf
+
+    # integers beyond 64 bits can be encoded
+    assert json_loads(json_dumps({"a": 2**70}))["a"] == 2**70
+
+
+def test_pack_float32():
+    import struct
+
+    import numpy as np
+
+    from terracotta.drivers.relational_meta_store import pack_float32
+
+    values = [0.5, 1.25, -3.0]
+    expected = np.array(values, dtype="float32").tobytes()
+    assert pack_float32(values) == expected
+    assert pack_float32(np.array(values, dtype="float64")) == expected
+    assert pack_float32(np.array(values, dtype=">f4")) == expected
+    assert list(struct.unpack("3f", expected)) == values
@@ -201,6 +201,352 @@ def test_precomputed_metadata(driver_path, provider, raster_file):
     assert all(np.all(data1[k] == data2[k]) for k in data1.keys())
 
 
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_get_metadata_many(driver_path, provider, raster_file):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    db.create(keys)
+    db.insert(["some", "value"], str(raster_file))
+    db.insert(["some", "other_value"], str(raster_file), skip_metadata=True)
+
+    datasets = [
+        ["some", "other_value"],
+        {"some": "some", "keynames": "value"},
+        ["some", "value"],
+    ]
+
+    meta_store_result = db.meta_store.get_metadata_many(
+        [db._standardize_keys(k) for k in datasets]
+    )
+    assert meta_store_result[0] is None
+    assert meta_store_result[1] == meta_store_result[2]
+
+    # lazy loads missing metadata
+    metadata = db.get_metadata_many(datasets)
+    assert len(metadata) == 3
+    assert all(all(key in m for key in METADATA_KEYS) for m in metadata)
+    assert metadata[0] == db.get_metadata(["some", "other_value"])
+    assert metadata[1] == db.get_metadata(["some", "value"])
+
+    assert db.get_metadata_many([]) == []
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_get_metadata_lite(driver_path, provider, raster_file):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    db.create(keys)
+    db.insert(["some", "value"], str(raster_file))
+    db.insert(["some", "other_value"], str(raster_file), skip_metadata=True)
+
+    lite_keys = ("bounds", "valid_percentage", "range", "mean", "stdev")
+
+    metadata = db.get_metadata(["some", "value"])
+    lite_metadata = db.get_metadata_lite(["some", "value"])
+    assert set(lite_metadata.keys()) == set(lite_keys)
+    assert lite_metadata == {key: metadata[key] for key in lite_keys}
+
+    # lazy loads missing metadata
+    assert (
+        db.meta_store.get_metadata_lite(db._standardize_keys(["some", "other_value"]))
+        is None
+    )
+    assert db.get_metadata_lite(["some", "other_value"]) == lite_metadata
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_metadata_cache(driver_path, provider, raster_file):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    db.create(keys)
+    db.insert(["some", "value"], str(raster_file))
+
+    metadata = db.get_metadata(["some", "value"])
+    assert db.meta_store._metadata_cache
+
+    # modifying the result does not affect cached metadata
+    metadata["metadata"] = "foo"
+    assert db.get_metadata(["some", "value"])["metadata"] != "foo"
+
+    # overwriting metadata invalidates the cache
+    new_metadata = dict(metadata, metadata={"bar": 1})
+    db.insert(["some", "value"], str(raster_file), metadata=new_metadata)
+    assert db.get_metadata(["some", "value"])["metadata"] == {"bar": 1}
+
+    db.delete(["some", "value"])
+    assert db.meta_store.get_metadata({"some": "some", "keynames": "value"}) is None
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_metadata_cache_disabled(driver_path, provider, raster_file, monkeypatch):
+    from terracotta import drivers, update_settings
+
+    monkeypatch.setenv("TC_METADATA_CACHE_SIZE", "0")
+    update_settings()
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    db.create(keys)
+    db.insert(["some", "value"], str(raster_file))
+
+    assert db.meta_store._metadata_cache is None
+    metadata = db.get_metadata(["some", "value"])
+    assert metadata
+
+    lite_metadata = db.get_metadata_lite(["some", "value"])
+    assert lite_metadata == {key: metadata[key] for key in lite_metadata}
+    assert db.get_metadata_many([["some", "value"]]) == [metadata]
+
+
+def test_metadata_cache_expires(tmpdir, raster_file, monkeypatch):
+    from cachetools import TTLCache
+
+    from terracotta import drivers, update_settings
+    from terracotta.drivers.geotiff_raster_store import GeoTiffRasterStore
+
+    monkeypatch.setenv("TC_METADATA_CACHE_TTL", "30")
+    update_settings()
+
+    dbfile = tmpdir.join("test.sqlite")
+    db_a = drivers.TerracottaDriver(
+        drivers.load_driver("sqlite")(str(dbfile)), GeoTiffRasterStore()
+    )
+    db_a.create(["some"])
+    db_b = drivers.TerracottaDriver(
+        drivers.load_driver("sqlite")(str(dbfile)), GeoTiffRasterStore()
+    )
+
+    assert db_a.meta_store._metadata_cache.ttl == 30
+
+    now = [0]
+    db_a.meta_store._metadata_cache = TTLCache(10, ttl=30, timer=lambda: now[0])
+
+    db_b.insert(["value"], str(raster_file))
+    assert db_a.meta_store.get_metadata({"some": "value"})
+
+    # deleted by another process, still cached until the entry expires
+    db_b.delete(["value"])
+    assert db_a.meta_store.get_metadata({"some": "value"})
+
+    now[0] = 31
+    assert db_a.meta_store.get_metadata({"some": "value"}) is None
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_metadata_cache_lite_and_many(driver_path, provider, raster_file, monkeypatch):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    db.create(keys)
+    db.insert(["some", "value"], str(raster_file))
+    db.insert(["some", "other_value"], str(raster_file))
+    db.meta_store._invalidate_caches()
+
+    # a lite read only reads and caches the scalar columns
+    lite_metadata = db.get_metadata_lite(["some", "value"])
+    assert ("some", "value") in db.meta_store._metadata_lite_cache
+    assert ("some", "value") not in db.meta_store._metadata_cache
+
+    def connect(*args, **kwargs):
+        raise AssertionError("should not connect")
+
+    with monkeypatch.context() as m:
+        m.setattr(db.meta_store, "connect", connect)
+        assert db.get_metadata_lite(["some", "value"]) == lite_metadata
+
+    # only datasets missing from the cache are queried
+    metadata = db.get_metadata_many([["some", "value"], ["some", "other_value"]])
+    assert len(db.meta_store._metadata_cache) == 2
+
+    # inserting invalidates both caches
+    db.insert(["some", "value"], str(raster_file), metadata=metadata[0])
+    assert ("some", "value") not in db.meta_store._metadata_lite_cache
+    assert ("some", "value") not in db.meta_store._metadata_cache
+    db.get_metadata_many([["some", "value"]])
+
+    def connect(*args, **kwargs):
+        raise AssertionError("should not connect")
+
+    with monkeypatch.context() as m:
+        m.setattr(db.meta_store, "connect", connect)
+        assert db.get_metadata_lite(["some", "value"]) == lite_metadata
+        assert (
+            db.get_metadata_many([["some", "value"], ["some", "other_value"]])
+            == metadata
+        )
+
+        # modifying results does not affect cached metadata
+        metadata = db.get_metadata_many([["some", "value"], ["some", "value"]])
+        metadata[0]["metadata"] = "foo"
+        assert metadata[1]["metadata"] != "foo"
+        assert db.get_metadata(["some", "value"])["metadata"] != "foo"
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_insert_many(driver_path, provider, raster_file):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    metadata = db.compute_metadata(str(raster_file))
+
+    db.create(keys)
+    db.insert(["some", "value"], "foo", skip_metadata=True)
+    db.insert_many(
+        [
+            (["some", "value"], str(raster_file), metadata),
+            ({"some": "some", "keynames": "other_value"}, str(raster_file), None),
+            (["some", "third_value"], str(raster_file), None),
+        ],
+        skip_metadata=True,
+    )
+
+    datasets = db.get_datasets()
+    assert datasets == {
+        ("some", "value"): str(raster_file),
+        ("some", "other_value"): str(raster_file),
+        ("some", "third_value"): str(raster_file),
+    }
+
+    data = db.meta_store.get_metadata({"some": "some", "keynames": "value"})
+    assert all(key in data for key in METADATA_KEYS)
+    assert (
+        db.meta_store.get_metadata({"some": "some", "keynames": "other_value"}) is None
+    )
+
+    # no-op
+    db.insert_many([])
+    assert len(db.get_datasets()) == 3
+
+    # computes missing metadata
+    db.insert_many(
+        [(["other", str(i)], str(raster_file), None) for i in range(3)],
+    )
+    for i in range(3):
+        data = db.meta_store.get_metadata({"some": "other", "keynames": str(i)})
+        assert all(key in data for key in METADATA_KEYS)
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_insert_overwrites_existing(driver_path, provider, raster_file):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    metadata = db.compute_metadata(str(raster_file))
+
+    db.create(keys)
+    db.insert(["some", "value"], str(raster_file), metadata=metadata)
+
+    new_metadata = dict(metadata, mean=-1.0, metadata={"foo": "bar"})
+    db.insert(["some", "value"], "foo", metadata=new_metadata)
+
+    assert db.get_datasets() == {("some", "value"): "foo"}
+
+    data = db.get_metadata(["some", "value"])
+    assert data["mean"] == -1.0
+    assert data["metadata"] == {"foo": "bar"}
+    assert data["range"] == metadata["range"]
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_insert_extra_metadata_roundtrip(driver_path, provider, raster_file):
+    import math
+
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    metadata = db.compute_metadata(
+        str(raster_file), extra_metadata={"nan": math.nan, "big": 2**70}
+    )
+
+    db.create(keys)
+    db.insert(["some", "value"], str(raster_file), metadata=metadata)
+
+    data = db.get_metadata(["some", "value"])
+    assert math.isnan(data["metadata"]["nan"])
+    assert data["metadata"]["big"] == 2**70
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_insert_many_chunked(driver_path, provider, raster_file, monkeypatch):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    metadata = db.compute_metadata(str(raster_file))
+
+    db.create(keys)
+    monkeypatch.setattr(db.meta_store, "_INSERT_CHUNK_SIZE", 2)
+
+    db.insert_many(
+        (["some", str(i)], str(raster_file), metadata if i % 2 else None)
+        for i in range(5)
+    )
+
+    assert len(db.get_datasets()) == 5
+    for i in range(5):
+        data = db.meta_store.get_metadata({"some": "some", "keynames": str(i)})
+        assert all(key in data for key in METADATA_KEYS)
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_insert_many_computes_metadata_in_chunks(
+    driver_path, provider, raster_file, monkeypatch
+):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    db.create(keys)
+    monkeypatch.setattr(db, "_INSERT_CHUNK_SIZE", 2)
+
+    consumed = []
+    written = []
+
+    def datasets():
+        for i in range(5):
+            consumed.append(i)
+            yield ["some", str(i)], str(raster_file), None
+
+    meta_store_insert_many = db.meta_store.insert_many
+
+    def insert_many(entries):
+        entries = list(entries)
+        # input is consumed one chunk at a time
+        assert len(consumed) == len(written) + len(entries)
+        written.extend(entries)
+        meta_store_insert_many(entries)
+
+    monkeypatch.setattr(db.meta_store, "insert_many", insert_many)
+
+    db.insert_many(datasets())
+
+    assert len(written) == 5
+    assert len(db.get_datasets()) == 5
+    for i in range(5):
+        data = db.meta_store.get_metadata({"some": "some", "keynames": str(i)})
+        assert all(key in data for key in METADATA_KEYS)
+
+
 @pytest.mark.parametrize("provider", DRIVERS)
 def test_invalid_insertion(monkeypatch, driver_path, provider, raster_file):
     from terracotta import drivers
@@ -395,6 +741,92 @@ def test_raster_cache(driver_path, provider, raster_file, asynchronous):
 
     np.testing.assert_array_equal(data1, data2)
     assert len(db.raster_store._raster_cache) == 1
+    assert len(db.raster_store._hot_cache) == 1
+
+    # evicted from uncompressed cache, falls back to compressed one
+    db.raster_store._hot_cache.clear()
+    data3 = db.get_raster_tile(["some", "value"], tile_size=(256, 256))
+    np.testing.assert_array_equal(data1, data3)
+    assert len(db.raster_store._hot_cache) == 1
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_raster_cache_readonly(driver_path, provider, raster_file):
+    """Modifying a returned tile in place must not affect later results"""
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    db.create(keys)
+    db.insert(["some", "value"], str(raster_file))
+
+    data1 = db.get_raster_tile(["some", "value"], tile_size=(256, 256))
+    expected = data1.copy()
+
+    with pytest.raises(ValueError):
+        data1[:] = 0
+
+    with pytest.raises(ValueError):
+        data1[0, 0] = np.ma.masked
+
+    data2 = db.get_raster_tile(["some", "value"], tile_size=(256, 256))
+    np.testing.assert_array_equal(data2, expected)
+    np.testing.assert_array_equal(data2.mask, expected.mask)
+
+    # same for tiles promoted from the compressed cache
+    db.raster_store._hot_cache.clear()
+    data3 = db.get_raster_tile(["some", "value"], tile_size=(256, 256))
+
+    with pytest.raises(ValueError):
+        data3[:] = 0
+
+    np.testing.assert_array_equal(data3, expected)
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_raster_cache_small(driver_path, provider, raster_file):
+    """A small cache still holds tiles that fit into it as a whole"""
+    from terracotta import drivers, update_settings
+
+    update_settings(RASTER_CACHE_SIZE=1024 * 1024)
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    db.create(keys)
+    db.insert(["some", "value"], str(raster_file))
+
+    assert len(db.raster_store._raster_cache.shards) == 1
+
+    db.get_raster_tile(["some", "value"], tile_size=(256, 256))
+    assert len(db.raster_store._raster_cache) == 1
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_hot_raster_cache_bytes(driver_path, provider, raster_file):
+    """Uncompressed tiles count towards RASTER_CACHE_SIZE"""
+    from terracotta import drivers, update_settings
+
+    update_settings(RASTER_CACHE_SIZE=1024 * 1024)
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    db.create(keys)
+    db.insert(["some", "value"], str(raster_file))
+
+    hot_cache = db.raster_store._hot_cache
+    assert hot_cache.maxsize == 1024 * 1024 // 10
+
+    small_tile = db.get_raster_tile(["some", "value"], tile_size=(32, 32))
+    assert len(hot_cache) == 1
+    assert hot_cache.currsize == small_tile.nbytes + small_tile.mask.nbytes
+
+    # too large for the uncompressed tier, but still cached compressed
+    db.get_raster_tile(["some", "value"], tile_size=(256, 256))
+    assert len(hot_cache) == 1
+    assert len(db.raster_store._raster_cache) == 2
 
 
 @pytest.mark.parametrize("provider", DRIVERS)
@@ -422,6 +854,7 @@ def test_raster_cache_fail(driver_path, provider, raster_file, asynchronous):
         time.sleep(1)  # allow callback to finish
 
     assert len(db.raster_store._raster_cache) == 0
+    assert len(db.raster_store._hot_cache) == 0
 
 
 @pytest.mark.parametrize("provider", DRIVERS)
@@ -569,3 +1002,23 @@ def test_no_multiprocessing():
 
     executor = create_executor()
     assert isinstance(executor, concurrent.futures.ThreadPoolExecutor)
+
+
+def test_multiprocessing_unavailable(monkeypatch):
+    import concurrent.futures
+    import terracotta.drivers.geotiff_raster_store as geotiff_raster_store
+
+    def broken_process_pool(*args, **kwargs):
+        raise OSError("monkeypatched")
+
+    with monkeypatch.context() as m:
+        m.setattr(geotiff_raster_store, "_multiprocessing_available", None)
+        m.setattr(geotiff_raster_store, "ProcessPoolExecutor", broken_process_pool)
+
+        with pytest.warns(UserWarning, match="Multiprocessing is not available"):
+            executor = geotiff_raster_store.create_executor()
+        assert isinstance(executor, concurrent.futures.ThreadPoolExecutor)
+
+        # detection result is cached, no further warnings
+        executor = geotiff_raster_store.create_executor()
+        assert isinstance(executor, concurrent.futures.ThreadPoolExecutor)
@@ -11,6 +11,10 @@ def test_metadata_handler(use_testdb):
     assert len(md.keys()) == 3
     assert all(k in md.keys() for k in ("metadata", "bounds", "keys"))
 
+    md = metadata.metadata(["bounds", "range"], ds)
+    full_md = metadata.metadata(None, ds)
+    assert md == {k: full_md[k] for k in ("bounds", "range", "keys")}
+
 
 def test_multiple_metadata_handler(use_testdb):
     from terracotta.handlers import metadata, datasets
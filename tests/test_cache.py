@@ -1,6 +1,7 @@
 import zlib
 
 import numpy as np
+import pytest
 
 
 def test_get_size():
@@ -11,3 +12,38 @@ def test_get_size():
     mask = zlib.compress(np.zeros(tile_shape), 9)
     size = CompressedLFUCache._get_size((data, mask, "float64", tile_shape))
     assert 1450 < size < 1550
+
+
+def test_sharded_cache():
+    from terracotta.cache import ShardedCache
+
+    cache = ShardedCache(dict, num_shards=4)
+    for i in range(10):
+        cache[i] = str(i)
+
+    assert len(cache) == 10
+    assert cache[3] == "3"
+    assert all(len(shard) > 0 for shard in cache.shards)
+
+    with pytest.raises(KeyError):
+        cache[100]
+
+
+def test_compressed_lru_cache():
+    from terracotta.cache import CompressedLRUCache
+
+    data = np.ma.masked_array(np.arange(16.0).reshape(4, 4), mask=np.eye(4))
+    item_size = CompressedLRUCache._get_size(CompressedLRUCache._compress_ma(data, 9))
+
+    cache = CompressedLRUCache(2 * item_size, compression_level=9)
+    cache["a"] = data
+    cache["b"] = data
+
+    out = cache["a"]
+    np.testing.assert_array_equal(out.data, data.data)
+    np.testing.assert_array_equal(out.mask, data.mask)
+
+    # least recently used entry is evicted first
+    cache["c"] = data
+    assert "a" in cache
+    assert "b" not in cache